@@ -79,10 +79,18 @@ class App(tk.Tk):
         self.status_menu = tk.OptionMenu(self.left_frame, self.status_var, "All", "Available", "Rented")
         self.status_menu.grid(row=0, column=2, sticky="w", pady=5)
 
+        # Group mode: select several rows to rent / return them in one go
+        self.multi_var = tk.BooleanVar(value=False)
+        self.chk_multi = tk.Checkbutton(
+            self.left_frame, text="Group select", variable=self.multi_var, command=self.toggle_multi_select
+        )
+        self.chk_multi.grid(row=0, column=3, sticky="w", pady=5)
+
         self.tree = ttk.Treeview(
             self.left_frame,
             columns=("model", "plate", "price", "status"),
             show="headings",
+            selectmode="browse",
             height=15
         )
         self.tree.grid(row=1, column=0, columnspan=4, sticky="nsew", pady=5)
@@ -109,21 +117,34 @@ class App(tk.Tk):
             self.after_cancel(self._filter_after_id)
         self._filter_after_id = self.after(250, self.refresh_vehicle_list)
 
+    def toggle_multi_select(self):
+        if self.multi_var.get():
+            self.tree.configure(selectmode="extended")
+        else:
+            self.tree.configure(selectmode="browse")
+            selected = self.tree.selection()
+            if len(selected) > 1:
+                self.tree.selection_set(selected[0])
+
     def on_tree_select(self, _event=None):
         selected = self.tree.selection()
         if not selected:
             return
-        values = self.tree.item(selected[0], "values")
-        if len(values) < 2:
+        plates = []
+        for item in selected:
+            values = self.tree.item(item, "values")
+            if len(values) >= 2:
+                plates.append(values[1])
+        if not plates:
             return
-        plate = values[1]
+        plate = plates[0]
 
-        # Auto-fill any plate fields if visible
+        # Auto-fill any plate fields if visible (rent/return take the whole group)
         self.ent_rent_plate.delete(0, tk.END)
-        self.ent_rent_plate.insert(0, plate)
+        self.ent_rent_plate.insert(0, ", ".join(plates))
 
         self.ent_return_plate.delete(0, tk.END)
-        self.ent_return_plate.insert(0, plate)
+        self.ent_return_plate.insert(0, ", ".join(plates))
 
         self.ent_delete_plate.delete(0, tk.END)
         self.ent_delete_plate.insert(0, plate)
@@ -183,7 +204,7 @@ class App(tk.Tk):
 
         # --- Rent form widgets
         self.lbl_rent_header = tk.Label(self.right_frame, text="VEHICLE RENTAL FORM", font=("Arial", 11, "bold"))
-        self.lbl_rent_plate = tk.Label(self.right_frame, text="License Plate:", anchor="w")
+        self.lbl_rent_plate = tk.Label(self.right_frame, text="License Plate(s):", anchor="w")
         self.ent_rent_plate = tk.Entry(self.right_frame, width=30)
         self.lbl_rent_start = tk.Label(self.right_frame, text="Start Date:", anchor="w")
         self.ent_rent_start = DateEntry(self.right_frame, width=27, date_pattern="dd/mm/yyyy")
@@ -193,7 +214,7 @@ class App(tk.Tk):
 
         # --- Return form widgets
         self.lbl_return_header = tk.Label(self.right_frame, text="VEHICLE RETURN FORM", font=("Arial", 11, "bold"))
-        self.lbl_return_plate = tk.Label(self.right_frame, text="License Plate:", anchor="w")
+        self.lbl_return_plate = tk.Label(self.right_frame, text="License Plate(s):", anchor="w")
         self.ent_return_plate = tk.Entry(self.right_frame, width=30)
         self.btn_return_vehicle = tk.Button(self.right_frame, text="Return Vehicle", bg="green", fg="white", command=self.return_vehicle)
 
@@ -248,11 +269,26 @@ class App(tk.Tk):
         except Exception as e:
             messagebox.showwarning("Error", str(e))
 
+    @staticmethod
+    def _split_plates(text: str):
+        return [p.strip() for p in text.split(",") if p.strip()]
+
     def rent_vehicle(self):
         try:
-            plate = self.ent_rent_plate.get().strip()
+            plates = self._split_plates(self.ent_rent_plate.get())
             start = self.ent_rent_start.get_date()
             end = self.ent_rent_end.get_date()
+            if len(plates) > 1:
+                results, total_fee = self.service.rent_many(plates, start, end)
+                self.refresh_vehicle_list()
+                lines = "\n".join(f"{model} ({plate}): {fee}₺" for plate, _days, fee, model in results)
+                messagebox.showinfo(
+                    "Success",
+                    f"{len(results)} vehicles rented for {results[0][1]} days.\n{lines}\nTotal Fee: {total_fee}₺"
+                )
+                return
+
+            plate = plates[0] if plates else ""
             days, fee, model = self.service.rent_vehicle(plate, start, end)
 
             self.refresh_vehicle_list()
@@ -265,7 +301,15 @@ class App(tk.Tk):
 
     def return_vehicle(self):
         try:
-            plate = self.ent_return_plate.get().strip()
+            plates = self._split_plates(self.ent_return_plate.get())
+            if len(plates) > 1:
+                returned = self.service.return_many(plates)
+                self.refresh_vehicle_list()
+                lines = "\n".join(f"{model} ({plate})" for plate, model in returned)
+                messagebox.showinfo("Success", f"{len(returned)} vehicles returned:\n{lines}")
+                return
+
+            plate = plates[0] if plates else ""
             model = self.service.return_vehicle(plate)
             self.refresh_vehicle_list()
             messagebox.showinfo("Success", f"Vehicle returned: {model} ({plate})")
@@ -0,0 +1,179 @@
+from __future__ import annotations
+import asyncio
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .models import Vehicle
+from .service import CarRentalService
+from .storage import JsonStorage
+
+T = TypeVar("T")
+
+
+class AsyncJsonStorage:
+    """
+    Async facade over JsonStorage.
+
+    Every call runs on a bounded thread pool so file I/O never blocks the
+    event loop. Cancelling an awaiting task cancels a call that has not
+    started yet; a call that is already running finishes in its thread.
+    """
+
+    def __init__(self, storage: JsonStorage, max_workers: int = 4):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        self.storage = storage
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="storage")
+
+    async def run(self, fn: Callable[..., T], *args, timeout: Optional[float] = None,
+                  on_done: Optional[Callable[[], None]] = None) -> T:
+        """
+        Run fn(*args) on the storage executor.
+        `on_done` is called on the event loop once fn has finished (or was
+        cancelled before starting), even if the awaiting task gave up earlier.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            cf = self._executor.submit(fn, *args)
+        except RuntimeError:
+            # Executor already shut down
+            if on_done is not None:
+                on_done()
+            raise
+        if on_done is not None:
+            cf.add_done_callback(lambda _f: loop.call_soon_threadsafe(on_done))
+        return await asyncio.wait_for(asyncio.wrap_future(cf), timeout)
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+
+    # Vehicles
+    async def load_vehicles(self, timeout: Optional[float] = None) -> List[Vehicle]:
+        return await self.run(self.storage.load_vehicles, timeout=timeout)
+
+    async def save_vehicles(self, vehicles: List[Vehicle], timeout: Optional[float] = None) -> None:
+        await self.run(self.storage.save_vehicles, vehicles, timeout=timeout)
+
+    # Records / logs
+    async def load_records(self, timeout: Optional[float] = None) -> List[str]:
+        return await self.run(self.storage.load_records, timeout=timeout)
+
+    async def append_record(self, line: str, timeout: Optional[float] = None) -> None:
+        await self.run(self.storage.append_record, line, timeout=timeout)
+
+    async def append_records(self, lines: List[str], timeout: Optional[float] = None) -> None:
+        await self.run(self.storage.append_records, lines, timeout=timeout)
+
+    async def count_records(self, timeout: Optional[float] = None) -> int:
+        return await self.run(self.storage.count_records, timeout=timeout)
+
+    async def read_records(self, start: int, stop: int, timeout: Optional[float] = None) -> List[str]:
+        return await self.run(self.storage.read_records, start, stop, timeout=timeout)
+
+    # Stats
+    async def load_stats(self, timeout: Optional[float] = None) -> Dict[str, int]:
+        return await self.run(self.storage.load_stats, timeout=timeout)
+
+    async def save_stats(self, stats: Dict[str, int], timeout: Optional[float] = None) -> None:
+        await self.run(self.storage.save_stats, stats, timeout=timeout)
+
+
+class AsyncCarRentalService:
+    """
+    asyncio-native counterpart of CarRentalService.
+
+    Business rules are CarRentalService's own; each call runs on the
+    storage executor. The fleet lives in a single vehicles.json, so that
+    file is the only write shard: writers are serialized by one
+    asyncio.Lock, while fleet and report reads run concurrently with each
+    other and with writes (JsonStorage replaces files atomically, retrying
+    on Windows while a reader still has the old file open).
+    Log reads also take the lock, because appends patch records.json in place.
+
+    Every method accepts `timeout` (seconds, defaults to the service-wide
+    value). It covers waiting for the lock as well as the call itself. A
+    write that already started when its caller times out or is cancelled
+    still completes, and the lock is held until it does.
+    """
+
+    def __init__(self, storage: AsyncJsonStorage, timeout: Optional[float] = None):
+        self.storage = storage
+        self.timeout = timeout
+        self._sync = CarRentalService(storage.storage)
+        self._write_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "AsyncCarRentalService":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.storage.aclose()
+
+    async def _read(self, fn: Callable[..., T], *args, timeout: Optional[float] = None) -> T:
+        return await self.storage.run(fn, *args, timeout=self._timeout(timeout))
+
+    async def _exclusive(self, fn: Callable[..., T], *args, timeout: Optional[float] = None) -> T:
+        timeout = self._timeout(timeout)
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+
+        await asyncio.wait_for(self._write_lock.acquire(), timeout)
+        remaining = None if deadline is None else max(0.0, deadline - loop.time())
+        # Released by the executor callback, not here: a cancelled caller
+        # must not let the next writer in while this one is still running.
+        return await self.storage.run(fn, *args, timeout=remaining, on_done=self._write_lock.release)
+
+    def _timeout(self, timeout: Optional[float]) -> Optional[float]:
+        return self.timeout if timeout is None else timeout
+
+    # ---------- Public API ----------
+
+    async def list_vehicles(self, timeout: Optional[float] = None) -> List[Vehicle]:
+        return await self._read(self._sync.list_vehicles, timeout=timeout)
+
+    async def add_vehicle(self, model_name: str, plate_raw: str, daily_price: int,
+                          timeout: Optional[float] = None) -> None:
+        await self._exclusive(self._sync.add_vehicle, model_name, plate_raw, daily_price, timeout=timeout)
+
+    async def rent_vehicle(self, plate_raw: str, start_date, end_date,
+                           timeout: Optional[float] = None) -> Tuple[int, int, str]:
+        return await self._exclusive(self._sync.rent_vehicle, plate_raw, start_date, end_date, timeout=timeout)
+
+    async def return_vehicle(self, plate_raw: str, timeout: Optional[float] = None) -> str:
+        return await self._exclusive(self._sync.return_vehicle, plate_raw, timeout=timeout)
+
+    async def rent_many(self, plates_raw: List[str], start_date, end_date,
+                        timeout: Optional[float] = None) -> Tuple[List[Tuple[str, int, int, str]], int]:
+        return await self._exclusive(self._sync.rent_many, plates_raw, start_date, end_date, timeout=timeout)
+
+    async def return_many(self, plates_raw: List[str],
+                          timeout: Optional[float] = None) -> List[Tuple[str, str]]:
+        return await self._exclusive(self._sync.return_many, plates_raw, timeout=timeout)
+
+    async def edit_vehicle(self, old_plate_raw: str, new_model: str, new_plate_raw: str,
+                           new_daily_price: int, timeout: Optional[float] = None) -> None:
+        await self._exclusive(self._sync.edit_vehicle, old_plate_raw, new_model, new_plate_raw,
+                               new_daily_price, timeout=timeout)
+
+    async def delete_vehicle(self, plate_raw: str, timeout: Optional[float] = None) -> str:
+        return await self._exclusive(self._sync.delete_vehicle, plate_raw, timeout=timeout)
+
+    async def get_report(self, timeout: Optional[float] = None):
+        """
+        Runs without the writer lock, and vehicles.json and stats.json are
+        read separately: during a concurrent rental the report can show the
+        vehicle as rented before its fee is in total_revenue.
+        """
+        return await self._read(self._sync.get_report, timeout=timeout)
+
+    async def get_recent_logs(self, limit: int = 20, timeout: Optional[float] = None) -> List[str]:
+        return await self._exclusive(self._sync.get_recent_logs, limit, timeout=timeout)
+
+    async def get_log_page(self, page: int, page_size: int = 20,
+                           timeout: Optional[float] = None) -> List[str]:
+        return await self._exclusive(self._sync.get_log_page, page, page_size, timeout=timeout)
+
+    async def get_logs_around(self, when: datetime.datetime, before: int = 10, after: int = 10,
+                              timeout: Optional[float] = None) -> List[str]:
+        return await self._exclusive(self._sync.get_logs_around, when, before, after, timeout=timeout)
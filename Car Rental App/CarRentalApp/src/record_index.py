@@ -0,0 +1,360 @@
+from __future__ import annotations
+import json
+import mmap
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from .utils import parse_ts, replace_with_retry, stat_key, ts_key
+
+
+CHECKPOINT_STRIDE = 256
+
+# Index header: magic, checkpoint stride, record count, then the stat key
+# (inode, mtime_ns, size) of records.json as last written by us. Any other
+# writer changes the key, which marks the index stale.
+_HEADER = struct.Struct("<4sIQQqQ")  # ..., ino, mtime_ns, size
+_MAGIC = b"RIDX"
+
+# Layout produced by json.dump(records, indent=4, ensure_ascii=False)
+_OPEN = b"[\n    "
+_SEP = b",\n    "
+_CLOSE = b"\n]"
+_EMPTY = b"[]"
+
+_WHITESPACE = " \t\n\r"
+_TAIL = 4096  # bytes read from the end of records.json to find "]"
+
+_decoder = json.JSONDecoder()
+
+
+def _encode_line(line: str) -> bytes:
+    return json.dumps(line, ensure_ascii=False).encode("utf-8")
+
+
+def _skip_ws(text: str, i: int) -> int:
+    while i < len(text) and text[i] in _WHITESPACE:
+        i += 1
+    return i
+
+
+def scan_records(data: bytes, strict: bool = True) -> Tuple[array, List[str]]:
+    """
+    Parse records.json bytes into (byte offset of each record, records).
+
+    Raises ValueError unless `data` is a JSON list of strings. With
+    strict=False, returns the records decoded before the first problem
+    instead, e.g. what survives a torn append.
+    """
+    offsets = array("Q")
+    records: List[str] = []
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError as e:
+        if strict:
+            raise
+        text = data[:e.start].decode("utf-8")
+
+    char_pos = byte_pos = 0
+    try:
+        i = _skip_ws(text, 0)
+        if text[i:i + 1] != "[":
+            raise ValueError("records.json is not a JSON list.")
+        i = _skip_ws(text, i + 1)
+        if text[i:i + 1] == "]":
+            end = i + 1
+        else:
+            while True:
+                value, next_i = _decoder.raw_decode(text, i)
+                if not isinstance(value, str):
+                    raise ValueError("records.json holds a record that is not a string.")
+                byte_pos += len(text[char_pos:i].encode("utf-8"))
+                char_pos = i
+                offsets.append(byte_pos)
+                records.append(value)
+
+                i = _skip_ws(text, next_i)
+                c = text[i:i + 1]
+                if c == ",":
+                    i = _skip_ws(text, i + 1)
+                elif c == "]":
+                    end = i + 1
+                    break
+                else:
+                    raise ValueError("records.json ends before the record list is closed.")
+        if _skip_ws(text, end) != len(text):
+            raise ValueError("Unexpected data after the record list.")
+    except ValueError:
+        if strict:
+            raise
+    return offsets, records
+
+
+def first_at_or_after(lines: Sequence[str], when) -> int:
+    """Position of the first line logged at or after `when` (len(lines) if none)."""
+    return _first_at_or_after(lines, _when_key(when))
+
+
+def _when_key(when) -> int:
+    # Log timestamps are whole seconds: round `when` up, so 00:00:00.5 is
+    # after a record logged at 00:00:00
+    key = ts_key(when)
+    return key + 1 if when.microsecond else key
+
+
+def _first_at_or_after(lines: Sequence[str], key: int) -> int:
+    for i, line in enumerate(lines):
+        ts = parse_ts(line)
+        if ts is not None and ts_key(ts) >= key:
+            return i
+    return len(lines)
+
+
+class RecordIndex:
+    """
+    Byte-offset index over records.json for random access into the log.
+
+    Sidecar files (next to records.json):
+    - records.idx: header + one uint64 byte offset per record
+    - records.ckpt: one int64 timestamp key per CHECKPOINT_STRIDE records
+
+    records.json stays a plain JSON list (our own writes use the layout
+    json.dump(indent=4) produces). Reads mmap both files and decode only
+    the requested records; appends patch the end of each file in place.
+    Building the index only reads records.json; it is rewritten solely by
+    write_all, which replaces it atomically.
+    """
+
+    def __init__(self, records_path: Path, stride: int = CHECKPOINT_STRIDE):
+        self.records_path = Path(records_path)
+        self.index_path = self.records_path.with_suffix(".idx")
+        self.checkpoints_path = self.records_path.with_suffix(".ckpt")
+        self.stride = stride
+
+    # ---------- Writing ----------
+
+    def write_all(self, records: Sequence[str]) -> None:
+        """Replace records.json with `records` and rebuild both sidecar files."""
+        offsets = array("Q")
+        checkpoints = array("q")
+        if records:
+            chunks = [_OPEN]
+            pos = len(_OPEN)
+            for i, line in enumerate(records):
+                if i:
+                    chunks.append(_SEP)
+                    pos += len(_SEP)
+                encoded = _encode_line(line)
+                offsets.append(pos)
+                chunks.append(encoded)
+                pos += len(encoded)
+                if i % self.stride == 0:
+                    checkpoints.append(self._checkpoint_key(line, checkpoints))
+            chunks.append(_CLOSE)
+            data = b"".join(chunks)
+        else:
+            data = _EMPTY
+
+        key = self._write_atomic(self.records_path, data)
+        self._write_sidecars(offsets, checkpoints, key)
+
+    def build(self) -> None:
+        """
+        Index records.json as it is on disk. Only the sidecar files are
+        written. Raises ValueError if records.json is not a JSON list of strings.
+        """
+        for _attempt in range(3):
+            with self.records_path.open("rb") as f:
+                before = stat_key(os.fstat(f.fileno()))
+                data = f.read()
+                key = stat_key(os.fstat(f.fileno()))
+            if before == key:
+                break
+        else:
+            raise ValueError("records.json kept changing while it was being indexed.")
+
+        offsets, records = scan_records(data)
+        checkpoints = array("q")
+        for i in range(0, len(records), self.stride):
+            checkpoints.append(self._checkpoint_key(records[i], checkpoints))
+        self._write_sidecars(offsets, checkpoints, key)
+
+    def append(self, lines: Sequence[str]) -> bool:
+        """
+        Append lines without rewriting existing records.
+        Returns False if the index is stale; the caller should rebuild it.
+        """
+        header = self._read_header()
+        if header is None:
+            return False
+        count, data_size = header
+        if not lines:
+            return True
+        if count == 0:
+            return False  # "[]" -> full write is just as cheap
+
+        with self.records_path.open("rb") as f:
+            f.seek(max(0, data_size - _TAIL))
+            tail = f.read()
+        stripped = tail.rstrip()
+        if not stripped.endswith(b"]"):
+            return False
+        # New records go right after the last one, replacing "\n]" and any padding
+        pos = data_size - len(tail) + len(stripped[:-1].rstrip())
+
+        offsets = array("Q")
+        seed = self._read_last_checkpoint()
+        checkpoints = array("q", seed)
+        chunks = []
+        write_from = pos
+        for i, line in enumerate(lines, start=count):
+            encoded = _encode_line(line)
+            chunks.append(_SEP)
+            pos += len(_SEP)
+            offsets.append(pos)
+            chunks.append(encoded)
+            pos += len(encoded)
+            if i % self.stride == 0:
+                checkpoints.append(self._checkpoint_key(line, checkpoints))
+        chunks.append(_CLOSE)
+        new_checkpoints = checkpoints[len(seed):]
+
+        # records.json first, index header last: a crash in between leaves a
+        # stat key mismatch, which makes the next reader rebuild the index.
+        with self.records_path.open("r+b") as f:
+            f.seek(write_from)
+            f.write(b"".join(chunks))
+            f.truncate()
+            key = self._written_key(f)
+        with self.checkpoints_path.open("ab") as f:
+            new_checkpoints.tofile(f)
+        with self.index_path.open("r+b") as f:
+            f.seek(_HEADER.size + count * offsets.itemsize)
+            offsets.tofile(f)
+            f.seek(0)
+            f.write(self._pack_header(count + len(offsets), key))
+        return True
+
+    # ---------- Reading ----------
+
+    def is_valid(self) -> bool:
+        return self._read_header() is not None
+
+    def count(self) -> int:
+        header = self._read_header()
+        return header[0] if header else 0
+
+    def read(self, start: int, stop: int) -> List[str]:
+        """Return records[start:stop] (non-negative bounds, clamped to count)."""
+        header = self._read_header()
+        if header is None:
+            raise RuntimeError("Record index is stale; rebuild it first.")
+        count, data_size = header
+        start = max(0, start)
+        stop = min(count, stop)
+        if start >= stop:
+            return []
+
+        # One extra offset marks the end of the last requested record
+        offsets = array("Q")
+        end = min(stop + 1, count)
+        with self.index_path.open("rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as idx:
+            offsets.frombytes(idx[_HEADER.size + start * offsets.itemsize:_HEADER.size + end * offsets.itemsize])
+        if end == stop:
+            offsets.append(data_size)
+
+        result = []
+        with self.records_path.open("rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for lo, hi in zip(offsets, offsets[1:]):
+                # Slice runs up to the next record; raw_decode ignores the separator
+                value, _end = _decoder.raw_decode(mm[lo:hi].decode("utf-8"))
+                result.append(str(value))
+        return result
+
+    def find_time(self, when) -> int:
+        """
+        Position of the first record logged at or after `when`
+        (count() if there is none). Assumes records are appended in time order.
+        """
+        count = self.count()
+        if count == 0:
+            return 0
+        key = _when_key(when)
+        checkpoints = array("q")
+        with self.checkpoints_path.open("rb") as f:
+            checkpoints.frombytes(f.read())
+
+        block = bisect_left(checkpoints, key)
+        if block == 0:
+            return 0
+        lo = (block - 1) * self.stride
+        hi = min(count, block * self.stride)
+        return lo + _first_at_or_after(self.read(lo, hi), key)
+
+    # ---------- Helpers ----------
+
+    def _read_header(self) -> Optional[Tuple[int, int]]:
+        """Return (count, data_size) if the index matches records.json, else None."""
+        try:
+            key = stat_key(self.records_path.stat())
+            with self.index_path.open("rb") as f:
+                raw = f.read(_HEADER.size)
+            ckpt_size = self.checkpoints_path.stat().st_size
+        except FileNotFoundError:
+            return None
+        if len(raw) != _HEADER.size:
+            return None
+        magic, stride, count, *indexed_key = _HEADER.unpack(raw)
+        if magic != _MAGIC or stride != self.stride or tuple(indexed_key) != key:
+            return None
+        if ckpt_size != -(-count // stride) * array("q").itemsize:
+            return None
+        return count, key[2]
+
+    def _pack_header(self, count: int, key: Tuple[int, int, int]) -> bytes:
+        return _HEADER.pack(_MAGIC, self.stride, count, *key)
+
+    def _write_sidecars(self, offsets: array, checkpoints: array, key: Tuple[int, int, int]) -> None:
+        # Checkpoints first: the index header is what declares both valid
+        self._write_atomic(self.checkpoints_path, checkpoints.tobytes())
+        self._write_atomic(self.index_path, self._pack_header(len(offsets), key) + offsets.tobytes())
+
+    def _write_atomic(self, path: Path, data: bytes) -> Tuple[int, int, int]:
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with tmp.open("wb") as f:
+                f.write(data)
+                key = self._written_key(f)
+            replace_with_retry(tmp, path)
+            return key
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _written_key(f) -> Tuple[int, int, int]:
+        f.flush()
+        return stat_key(os.fstat(f.fileno()))
+
+    def _read_last_checkpoint(self) -> List[int]:
+        last = array("q")
+        with self.checkpoints_path.open("rb") as f:
+            f.seek(0, 2)
+            if f.tell() >= last.itemsize:
+                f.seek(-last.itemsize, 2)
+                last.frombytes(f.read(last.itemsize))
+        return last.tolist()
+
+    @staticmethod
+    def _checkpoint_key(line: str, previous: array) -> int:
+        # Unparseable lines inherit the previous key so checkpoints stay sorted
+        ts = parse_ts(line)
+        if ts is not None:
+            return ts_key(ts)
+        return previous[-1] if len(previous) else 0
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import datetime
 from typing import List, Optional, Tuple
 
 from .models import Vehicle
@@ -98,6 +99,77 @@ class CarRentalService:
         ))
         return v.model_name
 
+    def rent_many(self, plates_raw: List[str], start_date, end_date) -> Tuple[List[Tuple[str, int, int, str]], int]:
+        """
+        Rent several vehicles for the same date range, all or nothing.
+        Returns ([(plate, days, fee, model_name), ...], total_fee)
+        """
+        days = (end_date - start_date).days + 1
+        if days <= 0:
+            raise ValueError("End date cannot be earlier than start date.")
+
+        vehicles = self._get_all()
+        targets = self._find_batch(vehicles, plates_raw)
+        for v in targets:
+            if v.status != "AVAILABLE":
+                raise ValueError(f"{v.plate}: This vehicle is already rented.")
+
+        results = []
+        lines = []
+        for v in targets:
+            v.status = "RENTED"
+            fee = days * v.daily_price
+            results.append((v.plate, days, fee, v.model_name))
+            lines.append(format_log(
+                "VEHICLE_RENTED", model=v.model_name, plate=v.plate, days=days, fee=fee
+            ))
+        total_fee = sum(r[2] for r in results)
+        self._save_all(vehicles)
+
+        stats = self.storage.load_stats()
+        stats["total_revenue"] += total_fee
+        self.storage.save_stats(stats)
+
+        self.storage.append_records(lines)
+        return results, total_fee
+
+    def return_many(self, plates_raw: List[str]) -> List[Tuple[str, str]]:
+        """
+        Return several vehicles, all or nothing.
+        Returns [(plate, model_name), ...]
+        """
+        vehicles = self._get_all()
+        targets = self._find_batch(vehicles, plates_raw)
+        for v in targets:
+            if v.status != "RENTED":
+                raise ValueError(f"{v.plate}: This vehicle is not currently rented.")
+
+        for v in targets:
+            v.status = "AVAILABLE"
+        self._save_all(vehicles)
+
+        self.storage.append_records([
+            format_log("VEHICLE_RETURNED", model=v.model_name, plate=v.plate) for v in targets
+        ])
+        return [(v.plate, v.model_name) for v in targets]
+
+    def _find_batch(self, vehicles: List[Vehicle], plates_raw: List[str]) -> List[Vehicle]:
+        # Validate the whole batch against one snapshot before changing anything
+        plates = [normalize_plate(p) for p in plates_raw]
+        if not plates:
+            raise ValueError("No vehicles selected.")
+        if len(set(plates)) != len(plates):
+            raise ValueError("The same license plate was selected more than once.")
+
+        by_plate = {v.plate: v for v in vehicles}
+        targets = []
+        for plate in plates:
+            v = by_plate.get(plate)
+            if v is None:
+                raise ValueError(f"{plate}: No vehicle found with that license plate.")
+            targets.append(v)
+        return targets
+
     def edit_vehicle(self, old_plate_raw: str, new_model: str, new_plate_raw: str, new_daily_price: int) -> None:
         old_plate = normalize_plate(old_plate_raw)
         new_plate = normalize_plate(new_plate_raw)
@@ -154,5 +226,28 @@ class CarRentalService:
         return total_revenue, available, available_count
 
     def get_recent_logs(self, limit: int = 20) -> List[str]:
-        logs = self.storage.load_records()
-        return list(reversed(logs[-limit:]))
\ No newline at end of file
+        total = self.storage.count_records()
+        logs = self.storage.read_records(max(0, total - limit), total)
+        return list(reversed(logs))
+
+    def get_log_page(self, page: int, page_size: int = 20) -> List[str]:
+        """
+        Return one page of the log in chronological order.
+        Pages are 1-based; a page past the end is empty.
+        """
+        if page < 1:
+            raise ValueError("Page number must be at least 1.")
+        if page_size <= 0:
+            raise ValueError("Page size must be a positive integer.")
+        start = (page - 1) * page_size
+        return self.storage.read_records(start, start + page_size)
+
+    def get_logs_around(self, when, before: int = 10, after: int = 10) -> List[str]:
+        """
+        Return up to `before` records logged before `when` and up to `after`
+        records logged at or after it, in chronological order.
+        """
+        if not isinstance(when, datetime.datetime):
+            when = datetime.datetime.combine(when, datetime.time.min)
+        pos = self.storage.find_record_at(when)
+        return self.storage.read_records(max(0, pos - before), pos + after)
\ No newline at end of file
@@ -0,0 +1,537 @@
+"""
+Deterministic workload simulator for capacity planning.
+
+Generates a seeded synthetic fleet and operation stream, replays it against
+a CarRentalService (single-threaded or with N worker threads) and reports
+throughput, latency percentiles and final-state consistency.
+
+    python -m src.simulator --seed 7 --ops 2000 --workers 4
+"""
+from __future__ import annotations
+import argparse
+import datetime
+import math
+import random
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .models import Vehicle
+from .service import CarRentalService
+from .storage import JsonStorage
+from .utils import normalize_plate
+
+
+OP_KINDS = ("add", "rent", "return", "edit", "delete", "report")
+
+DEFAULT_MIX: Dict[str, float] = {
+    "rent": 0.35,
+    "return": 0.30,
+    "report": 0.15,
+    "add": 0.08,
+    "edit": 0.07,
+    "delete": 0.05,
+}
+
+# Kinds that append exactly one log record when they succeed
+_MUTATING = ("add", "rent", "return", "edit", "delete")
+
+_MODELS = (
+    "Renault Clio", "Fiat Egea", "Toyota Corolla", "Volkswagen Polo",
+    "Hyundai I20", "Dacia Sandero", "Ford Focus", "Peugeot 208",
+    "Honda Civic", "Opel Corsa",
+)
+
+# Letters used on Turkish plates (no Q, W, X)
+_PLATE_LETTERS = "ABCDEFGHIJKLMNOPRSTUVYZ"
+
+
+def random_plate(rng: random.Random) -> str:
+    """
+    Return a random normalized Turkish plate ("PP L NNNN", "PP LL NNN(N)",
+    "PP LLL NN(N)") that matches utils._PLATE_RE.
+    """
+    province = rng.randint(1, 81)
+    n_letters = rng.randint(1, 3)
+    letters = "".join(rng.choice(_PLATE_LETTERS) for _ in range(n_letters))
+    if n_letters == 1:
+        n_digits = 4
+    elif n_letters == 2:
+        n_digits = rng.choice((3, 4))
+    else:
+        n_digits = rng.choice((2, 3))
+    number = rng.randint(10 ** (n_digits - 1), 10 ** n_digits - 1)
+    return f"{province:02d} {letters} {number}"
+
+
+def _raw_plate(rng: random.Random, plate: str) -> str:
+    # Feed the service the spellings users actually type
+    style = rng.randrange(3)
+    if style == 0:
+        return plate
+    if style == 1:
+        return plate.replace(" ", "")
+    return plate.lower()
+
+
+@dataclass
+class WorkloadConfig:
+    seed: int = 0
+    fleet_size: int = 50
+    operations: int = 1000
+    mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    arrival_rate: Optional[float] = None  # ops/second (Poisson); None = closed loop
+    max_rental_days: int = 14
+    start_date: datetime.date = datetime.date(2026, 6, 1)
+
+
+@dataclass
+class Operation:
+    kind: str
+    args: Tuple
+    at: float = 0.0  # scheduled offset from replay start (seconds)
+    substituted: bool = False  # an "add" drawn because no kind in the mix was possible
+
+
+@dataclass
+class _ShadowVehicle:
+    model_name: str
+    daily_price: int
+    status: str = "AVAILABLE"
+
+
+def generate_fleet(rng: random.Random, size: int, taken: Optional[set] = None) -> List[Vehicle]:
+    taken = set() if taken is None else taken
+    fleet = []
+    while len(fleet) < size:
+        plate = random_plate(rng)
+        if plate in taken:
+            continue
+        taken.add(plate)
+        fleet.append(Vehicle(
+            model_name=rng.choice(_MODELS),
+            plate=plate,
+            daily_price=rng.randrange(300, 3001, 50),
+        ))
+    return fleet
+
+
+def generate_workload(config: WorkloadConfig) -> Tuple[List[Vehicle], List[Operation]]:
+    """
+    Build (fleet, operations) for `config`. The same config always yields the
+    same workload. Operations are valid when applied in order; kinds that are
+    impossible at a given point (e.g. a return with nothing rented) are
+    re-drawn from the feasible ones. If no kind in the mix is possible at
+    all, an "add" is emitted instead and flagged `substituted`; a mix that
+    can never become possible (e.g. only returns) yields nothing but adds.
+    """
+    unknown = set(config.mix) - set(OP_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown operation kinds: {', '.join(sorted(unknown))}")
+    if config.fleet_size < 0 or config.operations < 0:
+        raise ValueError("Fleet size and operation count must not be negative.")
+
+    rng = random.Random(config.seed)
+    taken: set = set()
+    fleet = generate_fleet(rng, config.fleet_size, taken)
+    state = {v.plate: _ShadowVehicle(v.model_name, v.daily_price) for v in fleet}
+
+    kinds = [k for k in OP_KINDS if config.mix.get(k, 0) > 0]
+    weights = [config.mix[k] for k in kinds]
+    if not kinds and config.operations:
+        raise ValueError("Operation mix must have at least one positive ratio.")
+
+    ops: List[Operation] = []
+    clock = 0.0
+    while len(ops) < config.operations:
+        feasible = _feasible(state)
+        options = [(k, w) for k, w in zip(kinds, weights) if k in feasible]
+        substituted = not options
+        if substituted:
+            # Nothing in the mix is possible now; an add is always possible and
+            # makes rent/edit/delete possible next time
+            kind = "add"
+        else:
+            kind = rng.choices([k for k, _ in options], [w for _, w in options])[0]
+
+        if config.arrival_rate:
+            clock += rng.expovariate(config.arrival_rate)
+        ops.append(Operation(kind, _make_args(rng, config, kind, state, taken), clock, substituted))
+    return fleet, ops
+
+
+def _feasible(state: Dict[str, _ShadowVehicle]) -> set:
+    kinds = {"add", "report"}
+    if state:
+        kinds.add("edit")
+    if any(v.status == "AVAILABLE" for v in state.values()):
+        kinds.update(("rent", "delete"))
+    if any(v.status == "RENTED" for v in state.values()):
+        kinds.add("return")
+    return kinds
+
+
+def _make_args(rng: random.Random, config: WorkloadConfig, kind: str,
+               state: Dict[str, _ShadowVehicle], taken: set) -> Tuple:
+    plates = list(state)
+    if kind == "add":
+        (v,) = generate_fleet(rng, 1, taken)
+        state[v.plate] = _ShadowVehicle(v.model_name, v.daily_price)
+        return v.model_name, _raw_plate(rng, v.plate), v.daily_price
+    if kind == "rent":
+        plate = rng.choice([p for p in plates if state[p].status == "AVAILABLE"])
+        state[plate].status = "RENTED"
+        start = config.start_date + datetime.timedelta(days=rng.randrange(90))
+        end = start + datetime.timedelta(days=rng.randrange(config.max_rental_days))
+        return _raw_plate(rng, plate), start, end
+    if kind == "return":
+        plate = rng.choice([p for p in plates if state[p].status == "RENTED"])
+        state[plate].status = "AVAILABLE"
+        return (_raw_plate(rng, plate),)
+    if kind == "edit":
+        plate = rng.choice(plates)
+        new_plate = plate
+        if rng.random() < 0.2:
+            (v,) = generate_fleet(rng, 1, taken)
+            new_plate = v.plate
+        new_model = rng.choice(_MODELS)
+        new_price = rng.randrange(300, 3001, 50)
+        shadow = state.pop(plate)
+        state[new_plate] = _ShadowVehicle(new_model, new_price, shadow.status)
+        return _raw_plate(rng, plate), new_model, _raw_plate(rng, new_plate), new_price
+    if kind == "delete":
+        plate = rng.choice([p for p in plates if state[p].status == "AVAILABLE"])
+        del state[plate]
+        return (_raw_plate(rng, plate),)
+    return ()
+
+
+# ---------- Replay ----------
+
+@dataclass
+class SimulationReport:
+    operations: int = 0
+    succeeded: int = 0
+    rejected: int = 0   # ValueError raised by the service
+    errors: int = 0     # anything else
+    substituted: int = 0  # adds generated outside the configured mix
+    elapsed: float = 0.0
+    rentals: int = 0
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    problems: List[str] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        # Succeeded ops only: rejections are cheap and would flatter the rate
+        return self.succeeded / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def rentals_per_second(self) -> float:
+        return self.rentals / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def consistent(self) -> bool:
+        return not self.problems
+
+    def percentiles(self, kind: Optional[str] = None) -> Dict[str, float]:
+        """Latency percentiles in milliseconds (nearest-rank)."""
+        if kind is None:
+            samples = sorted(x for xs in self.latencies.values() for x in xs)
+        else:
+            samples = sorted(self.latencies.get(kind, []))
+        if not samples:
+            return {}
+        result = {}
+        for name, q in (("p50", 0.50), ("p90", 0.90), ("p99", 0.99)):
+            idx = max(0, math.ceil(q * len(samples)) - 1)
+            result[name] = samples[idx] * 1000
+        result["max"] = samples[-1] * 1000
+        return result
+
+    def format(self) -> str:
+        lines = [
+            f"Operations: {self.operations} (ok={self.succeeded}, "
+            f"rejected={self.rejected}, errors={self.errors})",
+            f"Elapsed: {self.elapsed:.3f}s | Throughput: {self.throughput:.1f} ok ops/s "
+            f"| Rentals: {self.rentals_per_second:.1f}/s",
+        ]
+        if self.substituted:
+            lines.insert(1, f"Warning: {self.substituted} ops were adds substituted for an "
+                            "operation mix that was not possible at that point")
+        for kind in [None] + sorted(self.latencies):
+            p = self.percentiles(kind)
+            if p:
+                label = kind or "all"
+                lines.append(f"  {label:<7} " + "  ".join(f"{k}={v:.2f}ms" for k, v in p.items()))
+        if self.problems:
+            lines.append("Consistency: FAILED")
+            lines.extend(f"  - {p}" for p in self.problems)
+        else:
+            lines.append("Consistency: OK")
+        return "\n".join(lines)
+
+
+def _call(service: CarRentalService, op: Operation):
+    if op.kind == "add":
+        return service.add_vehicle(*op.args)
+    if op.kind == "rent":
+        return service.rent_vehicle(*op.args)
+    if op.kind == "return":
+        return service.return_vehicle(*op.args)
+    if op.kind == "edit":
+        return service.edit_vehicle(*op.args)
+    if op.kind == "delete":
+        return service.delete_vehicle(*op.args)
+    return service.get_report()
+
+
+def _apply(shadow: Dict[str, _ShadowVehicle], op: Operation) -> None:
+    if op.kind == "add":
+        model, plate, price = op.args
+        shadow[normalize_plate(plate)] = _ShadowVehicle(model.strip().title(), price)
+    elif op.kind == "rent":
+        shadow[normalize_plate(op.args[0])].status = "RENTED"
+    elif op.kind == "return":
+        shadow[normalize_plate(op.args[0])].status = "AVAILABLE"
+    elif op.kind == "edit":
+        old_plate, model, new_plate, price = op.args
+        status = shadow.pop(normalize_plate(old_plate)).status
+        shadow[normalize_plate(new_plate)] = _ShadowVehicle(model.strip().title(), price, status)
+    elif op.kind == "delete":
+        del shadow[normalize_plate(op.args[0])]
+
+
+def _plates(op: Operation) -> List[str]:
+    """Normalized plates `op` reads or writes (an edit touches both)."""
+    if op.kind == "add":
+        return [normalize_plate(op.args[1])]
+    if op.kind == "edit":
+        return [normalize_plate(op.args[0]), normalize_plate(op.args[2])]
+    if op.kind == "report":
+        return []
+    return [normalize_plate(op.args[0])]
+
+
+def _shard(operations: List[Operation], workers: int) -> List[List[Operation]]:
+    """
+    Split the stream across workers so that every op on a vehicle runs on the
+    same worker, in stream order. Plates joined by an edit count as one
+    vehicle. Reports touch no plate and are dealt round-robin.
+    """
+    parent: Dict[str, str] = {}
+
+    def find(plate: str) -> str:
+        parent.setdefault(plate, plate)
+        while parent[plate] != plate:
+            parent[plate] = parent[parent[plate]]
+            plate = parent[plate]
+        return plate
+
+    for op in operations:
+        plates = _plates(op)
+        for other in plates[1:]:
+            parent[find(other)] = find(plates[0])
+
+    shards: List[List[Operation]] = [[] for _ in range(workers)]
+    owner: Dict[str, int] = {}
+    unowned = 0
+    for op in operations:
+        plates = _plates(op)
+        if plates:
+            w = owner.setdefault(find(plates[0]), len(owner) % workers)
+        else:
+            w, unowned = unowned % workers, unowned + 1
+        shards[w].append(op)
+    return shards
+
+
+def replay(service: CarRentalService, operations: List[Operation], workers: int = 1,
+           serialize: bool = True) -> SimulationReport:
+    """
+    Replay `operations` against `service` and check the final state.
+
+    With workers > 1 the stream is split across threads; ops on the same
+    vehicle stay on one thread in stream order, since the stream is only
+    valid in that order. JsonStorage does a read-modify-write per call, so `serialize` (default) runs service
+    calls under one lock; pass serialize=False to measure the raw race.
+    Successful operations are applied to a shadow fleet in completion order,
+    which is what the final state is checked against.
+
+    If the operations carry arrival times (WorkloadConfig.arrival_rate),
+    latency is measured from each op's scheduled arrival, so time spent
+    queued behind a saturated service is counted rather than omitted.
+    """
+    if workers < 1:
+        raise ValueError("Worker count must be at least 1.")
+
+    storage = service.storage
+    shadow = {v.plate: _ShadowVehicle(v.model_name, v.daily_price, v.status)
+              for v in storage.load_vehicles()}
+    base_records = storage.count_records()
+    base_revenue = storage.load_stats()["total_revenue"]
+
+    report = SimulationReport(operations=len(operations),
+                              substituted=sum(op.substituted for op in operations))
+    call_lock = threading.Lock()
+    result_lock = threading.Lock()
+    fees = [0]
+    mutations = [0]
+    open_loop = any(op.at > 0 for op in operations)
+
+    def run_one(op: Operation, started: float) -> None:
+        arrival = started + op.at
+        delay = arrival - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        t0 = arrival if open_loop else time.perf_counter()
+        outcome, value = "ok", None
+        try:
+            if serialize:
+                with call_lock:
+                    value = _call(service, op)
+                    dt = time.perf_counter() - t0
+                    with result_lock:
+                        _apply(shadow, op)
+            else:
+                value = _call(service, op)
+                dt = time.perf_counter() - t0
+                with result_lock:
+                    _apply(shadow, op)
+        except ValueError:
+            outcome, dt = "rejected", time.perf_counter() - t0
+        except Exception:
+            outcome, dt = "error", time.perf_counter() - t0
+
+        with result_lock:
+            report.latencies.setdefault(op.kind, []).append(dt)
+            if outcome == "ok":
+                report.succeeded += 1
+                if op.kind in _MUTATING:
+                    mutations[0] += 1
+                if op.kind == "rent":
+                    report.rentals += 1
+                    fees[0] += value[1]
+            elif outcome == "rejected":
+                report.rejected += 1
+            else:
+                report.errors += 1
+
+    def worker(shard: List[Operation], started: float) -> None:
+        for op in shard:
+            run_one(op, started)
+
+    started = time.perf_counter()
+    if workers == 1:
+        worker(operations, started)
+    else:
+        threads = [threading.Thread(target=worker, args=(shard, started), daemon=True)
+                   for shard in _shard(operations, workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    report.elapsed = time.perf_counter() - started
+
+    report.problems = check_consistency(
+        service, shadow,
+        expected_records=base_records + mutations[0],
+        expected_revenue=base_revenue + fees[0],
+    )
+    return report
+
+
+def check_consistency(service: CarRentalService, shadow: Dict[str, _ShadowVehicle],
+                      expected_records: int, expected_revenue: int) -> List[str]:
+    problems = []
+    vehicles = service.list_vehicles()
+    plates = [v.plate for v in vehicles]
+    if len(plates) != len(set(plates)):
+        problems.append("Duplicate license plates in fleet.")
+    for plate in plates:
+        try:
+            if normalize_plate(plate) != plate:
+                problems.append(f"Plate not normalized: {plate!r}")
+        except ValueError:
+            problems.append(f"Invalid plate stored: {plate!r}")
+
+    actual = {v.plate: (v.model_name, v.daily_price, v.status) for v in vehicles}
+    expected = {p: (s.model_name, s.daily_price, s.status) for p, s in shadow.items()}
+    if actual != expected:
+        missing = sorted(set(expected) - set(actual))
+        extra = sorted(set(actual) - set(expected))
+        changed = sorted(p for p in set(actual) & set(expected) if actual[p] != expected[p])
+        problems.append(
+            f"Fleet mismatch: {len(missing)} missing, {len(extra)} unexpected, {len(changed)} differing."
+        )
+
+    records = service.storage.count_records()
+    if records != expected_records:
+        problems.append(f"Log has {records} records, expected {expected_records}.")
+
+    revenue = service.storage.load_stats()["total_revenue"]
+    if revenue != expected_revenue:
+        problems.append(f"Total revenue is {revenue}, expected {expected_revenue}.")
+    return problems
+
+
+def run(config: WorkloadConfig, storage: JsonStorage, workers: int = 1,
+        serialize: bool = True,
+        service_factory: Callable[[JsonStorage], CarRentalService] = CarRentalService) -> SimulationReport:
+    """
+    Seed `storage` with the generated fleet, then replay the workload on it.
+    This replaces the fleet and adds log records and revenue: never pass the
+    app's real storage.
+    """
+    fleet, ops = generate_workload(config)
+    storage.save_vehicles(fleet)
+    return replay(service_factory(storage), ops, workers=workers, serialize=serialize)
+
+
+def _parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        kind, _, ratio = part.partition("=")
+        mix[kind.strip()] = float(ratio)
+    return mix
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay a synthetic rental workload.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fleet", type=int, default=50, help="initial fleet size")
+    parser.add_argument("--ops", type=int, default=1000, help="number of operations")
+    parser.add_argument("--mix", type=_parse_mix, default=None,
+                        help="e.g. rent=0.4,return=0.3,report=0.3")
+    parser.add_argument("--rate", type=float, default=None, help="arrival rate (ops/s)")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--no-serialize", action="store_true",
+                        help="let workers call the service concurrently")
+    parser.add_argument("--data-dir", default=None,
+                        help="empty storage directory to keep the results in "
+                             "(default: a temporary directory)")
+    parser.add_argument("--force", action="store_true",
+                        help="allow a non-empty --data-dir; its fleet, log and revenue are overwritten")
+    args = parser.parse_args(argv)
+
+    if args.data_dir and not args.force:
+        data_dir = Path(args.data_dir)
+        if data_dir.exists() and any(data_dir.iterdir()):
+            parser.error(f"{data_dir} is not empty; the simulator would overwrite its data "
+                         "(pass --force to allow this)")
+
+    config = WorkloadConfig(seed=args.seed, fleet_size=args.fleet, operations=args.ops,
+                            arrival_rate=args.rate)
+    if args.mix is not None:
+        config.mix = args.mix
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JsonStorage(args.data_dir or tmp)
+        report = run(config, storage, workers=args.workers, serialize=not args.no_serialize)
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
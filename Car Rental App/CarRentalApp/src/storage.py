@@ -1,9 +1,19 @@
 from __future__ import annotations
+import dataclasses
+import datetime
 import json
+import os
+import shutil
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
 from .models import Vehicle
+from .record_index import RecordIndex, first_at_or_after, scan_records
+from .utils import replace_with_retry, stat_key
+
+T = TypeVar("T")
 
 
 class JsonStorage:
@@ -13,7 +23,12 @@ class JsonStorage:
     Files:
     - vehicles.json: list of vehicles
     - records.json: list of log strings
+      (records.idx / records.ckpt: byte-offset index, see RecordIndex)
     - stats.json: {"total_revenue": int}
+
+    Decoded file contents are cached per file and reused while the file's
+    (inode, mtime_ns, size) is unchanged, so writes from another process are
+    picked up on the next load. Loaders always hand out copies.
     """
 
     def __init__(self, data_dir: str = "data"):
@@ -23,6 +38,8 @@ class JsonStorage:
         self.vehicles_path = self.data_dir / "vehicles.json"
         self.records_path = self.data_dir / "records.json"
         self.stats_path = self.data_dir / "stats.json"
+        self.records_index = RecordIndex(self.records_path)
+        self._cache: Dict[Path, Tuple[Tuple[int, int, int], Any]] = {}
 
         self._ensure_defaults()
 
@@ -44,39 +61,146 @@ class JsonStorage:
             # If corrupted, fall back to default (and do not crash UI)
             return default
 
-    def _write_json(self, path: Path, data) -> None:
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+    def _write_json(self, path: Path, data) -> Tuple[int, int, int]:
+        """Write atomically; return the stat key of the file as we wrote it."""
+        # Write-then-rename so concurrent readers never see a half-written file
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+                f.flush()
+                # Taken from our own handle: rename keeps inode and mtime, and
+                # a later writer cannot slip its version in under this key.
+                key = stat_key(os.fstat(f.fileno()))
+            replace_with_retry(tmp, path)
+            return key
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    # Read cache
+    @staticmethod
+    def _file_key(path: Path) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat_key(st)
+
+    def _load_cached(self, path: Path, parse: Callable[[], Any]) -> Any:
+        # Stat before reading: if the file changes mid-read, the stored key is
+        # already outdated and the next call reloads.
+        key = self._file_key(path)
+        hit = self._cache.get(path)
+        if key is not None and hit is not None and hit[0] == key:
+            return hit[1]
+        value = parse()
+        if key is not None:
+            self._cache[path] = (key, value)
+        return value
+
+    def _store_cached(self, path: Path, key: Tuple[int, int, int], value: Any) -> None:
+        self._cache[path] = (key, value)
 
     # Vehicles
     def load_vehicles(self) -> List[Vehicle]:
+        cached = self._load_cached(self.vehicles_path, self._parse_vehicles)
+        return [dataclasses.replace(v) for v in cached]
+
+    def _parse_vehicles(self) -> Tuple[Vehicle, ...]:
         raw = self._read_json(self.vehicles_path, [])
         if isinstance(raw, dict):
             # Backward-compat: convert dict values to list if needed
             raw = list(raw.values())
         if not isinstance(raw, list):
             raw = []
-        return [Vehicle.from_dict(x) for x in raw if isinstance(x, dict)]
+        return tuple(Vehicle.from_dict(x) for x in raw if isinstance(x, dict))
 
     def save_vehicles(self, vehicles: List[Vehicle]) -> None:
-        self._write_json(self.vehicles_path, [v.to_dict() for v in vehicles])
+        key = self._write_json(self.vehicles_path, [v.to_dict() for v in vehicles])
+        self._store_cached(self.vehicles_path, key, tuple(dataclasses.replace(v) for v in vehicles))
 
     # Records / logs
     def load_records(self) -> List[str]:
-        raw = self._read_json(self.records_path, [])
+        return list(self._load_cached(self.records_path, self._parse_records))
+
+    def _parse_records(self) -> Tuple[str, ...]:
+        raw = self._read_json(self.records_path, None)
+        if raw is None:
+            # Unreadable (e.g. cut short by a torn append): keep what decodes
+            try:
+                return tuple(scan_records(self.records_path.read_bytes(), strict=False)[1])
+            except FileNotFoundError:
+                return ()
         if isinstance(raw, dict):
             raw = list(raw.values())
         if not isinstance(raw, list):
             raw = []
-        return [str(x) for x in raw]
+        return tuple(str(x) for x in raw)
 
     def append_record(self, line: str) -> None:
-        records = self.load_records()
-        records.append(line)
-        self._write_json(self.records_path, records)
+        self.append_records([line])
+
+    def append_records(self, lines: List[str]) -> None:
+        """Append several log lines in one write."""
+        if self.records_index.append(lines):
+            return
+        try:
+            self.records_index.build()
+            if self.records_index.append(lines):
+                return
+            lossless = True
+        except (ValueError, FileNotFoundError):
+            lossless = False
+
+        # Not something we can patch in place (empty list, legacy dict form,
+        # torn write, ...): rewrite it, keeping a copy of the original bytes
+        # whenever the rewrite could drop anything.
+        records = list(self._parse_records())
+        if not lossless and self.records_path.exists():
+            backup = self.records_path.with_name(f"{self.records_path.name}.{time.time_ns()}.bak")
+            shutil.copy2(self.records_path, backup)
+        self.records_index.write_all(records + list(lines))
+
+    def _with_records_index(self, indexed: Callable[[], T], fallback: Callable[[List[str]], T]) -> T:
+        # Log reads never rewrite records.json: at most the sidecar index is rebuilt
+        try:
+            if not self.records_index.is_valid():
+                self.records_index.build()
+            return indexed()
+        except (ValueError, RuntimeError, FileNotFoundError):
+            pass
+        try:
+            # Offsets may be stale under an unchanged stat key; re-scan once
+            self.records_index.build()
+            return indexed()
+        except (ValueError, RuntimeError, FileNotFoundError):
+            # Not a plain list of strings: parse it in full, without the read
+            # cache (which keys on the same stat and could be just as stale)
+            return fallback(list(self._parse_records()))
+
+    def count_records(self) -> int:
+        return self._with_records_index(self.records_index.count, len)
+
+    def read_records(self, start: int, stop: int) -> List[str]:
+        """Return records[start:stop] without parsing the rest of the file."""
+        return self._with_records_index(
+            lambda: self.records_index.read(start, stop),
+            lambda records: records[max(0, start):max(0, stop)],
+        )
+
+    def find_record_at(self, when: datetime.datetime) -> int:
+        """Position of the first record logged at or after `when`."""
+        return self._with_records_index(
+            lambda: self.records_index.find_time(when),
+            lambda records: first_at_or_after(records, when),
+        )
 
     # Stats
     def load_stats(self) -> Dict[str, int]:
+        return dict(self._load_cached(self.stats_path, self._parse_stats))
+
+    def _parse_stats(self) -> Dict[str, int]:
         raw = self._read_json(self.stats_path, {"total_revenue": 0})
         if not isinstance(raw, dict):
             raw = {"total_revenue": 0}
@@ -87,4 +211,5 @@ class JsonStorage:
     def save_stats(self, stats: Dict[str, int]) -> None:
         if "total_revenue" not in stats or not isinstance(stats["total_revenue"], int):
             stats["total_revenue"] = 0
-        self._write_json(self.stats_path, stats)
\ No newline at end of file
+        key = self._write_json(self.stats_path, stats)
+        self._store_cached(self.stats_path, key, dict(stats))
\ No newline at end of file
@@ -1,8 +1,19 @@
 import re
 import datetime
+import os
+import time
+from typing import Optional, Tuple
 
 _PLATE_RE = re.compile(r"^\s*(\d{2})\s*([A-Z]{1,3})\s*(\d{2,4})\s*$", re.IGNORECASE)
 
+_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+_TS_LEN = len("2026-02-25 13:10:02")
+_TS_EPOCH = datetime.datetime(1970, 1, 1)
+
+_REPLACE_ATTEMPTS = 10
+_REPLACE_BACKOFF = 0.01
+_REPLACE_BACKOFF_MAX = 0.1
+
 
 def normalize_plate(raw: str) -> str:
     """
@@ -26,7 +37,7 @@ def normalize_plate(raw: str) -> str:
 
 def now_ts() -> str:
     """Return a stable timestamp string for logs."""
-    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return datetime.datetime.now().strftime(_TS_FORMAT)
 
 
 def format_log(event: str, **fields) -> str:
@@ -43,4 +54,40 @@ def format_log(event: str, **fields) -> str:
             parts.append(f'{k}="{v}"')
         else:
             parts.append(f"{k}={v}")
-    return " | ".join(parts)
\ No newline at end of file
+    return " | ".join(parts)
+
+
+def parse_ts(line: str) -> Optional[datetime.datetime]:
+    """Return the timestamp a format_log() line starts with, or None."""
+    try:
+        return datetime.datetime.strptime(line[:_TS_LEN], _TS_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def stat_key(st: os.stat_result) -> Tuple[int, int, int]:
+    """(inode, mtime_ns, size): identifies one version of a file on disk."""
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def replace_with_retry(src, dst) -> None:
+    """
+    os.replace(src, dst), retried with a short backoff (about 0.75 s in
+    total): Windows refuses to replace a file another thread or process
+    still has open for reading.
+    """
+    delay = _REPLACE_BACKOFF
+    for attempt in range(_REPLACE_ATTEMPTS):
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            if attempt == _REPLACE_ATTEMPTS - 1:
+                raise
+            time.sleep(delay)
+            delay = min(delay * 2, _REPLACE_BACKOFF_MAX)
+
+
+def ts_key(ts: datetime.datetime) -> int:
+    """Sortable integer key (seconds) for a naive log timestamp."""
+    return int((ts - _TS_EPOCH).total_seconds())
@@ -0,0 +1,70 @@
+import asyncio
+import tempfile
+import threading
+from pathlib import Path
+import datetime
+
+import pytest
+
+from src.storage import JsonStorage
+from src.async_service import AsyncCarRentalService, AsyncJsonStorage
+
+
+def _plates(n):
+    return [f"34 AB {100 + i}" for i in range(n)]
+
+
+def test_concurrent_rentals_are_serialized():
+    async def scenario(data_dir):
+        async with AsyncCarRentalService(AsyncJsonStorage(JsonStorage(data_dir))) as svc:
+            for plate in _plates(10):
+                await svc.add_vehicle("Renault Clio", plate, 500)
+
+            start = datetime.date(2026, 2, 20)
+            end = datetime.date(2026, 2, 21)
+            results = await asyncio.gather(
+                *(svc.rent_vehicle(p, start, end) for p in _plates(10)),
+                svc.rent_vehicle(_plates(10)[0], start, end),
+                svc.list_vehicles(),
+                svc.get_report(),
+                return_exceptions=True,
+            )
+            failures = [r for r in results if isinstance(r, ValueError)]
+            assert len(failures) == 1
+
+            total_revenue, available, _count = await svc.get_report()
+            assert total_revenue == 10 * 1000
+            assert available == []
+            assert len(await svc.get_recent_logs(limit=50)) == 20
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(scenario(str(Path(tmp) / "data")))
+
+
+def test_timeout_keeps_writer_lock_until_call_finishes():
+    async def scenario(data_dir):
+        storage = AsyncJsonStorage(JsonStorage(data_dir))
+        async with AsyncCarRentalService(storage) as svc:
+            release = threading.Event()
+            real_add = svc._sync.add_vehicle
+
+            def slow_add(*args):
+                release.wait(5)
+                return real_add(*args)
+
+            svc._sync.add_vehicle = slow_add
+            with pytest.raises(asyncio.TimeoutError):
+                await svc.add_vehicle("Renault Clio", "34 ABC 456", 500, timeout=0.05)
+
+            # The first write is still running, so the next writer must wait
+            with pytest.raises(asyncio.TimeoutError):
+                await svc.return_vehicle("34 ABC 456", timeout=0.05)
+
+            release.set()
+            svc._sync.add_vehicle = real_add
+            await svc.add_vehicle("Fiat Egea", "06 AB 1234", 400, timeout=5)
+            plates = sorted(v.plate for v in await svc.list_vehicles())
+            assert plates == ["06 AB 1234", "34 ABC 456"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(scenario(str(Path(tmp) / "data")))
@@ -0,0 +1,140 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+import datetime
+
+from src.storage import JsonStorage
+from src.service import CarRentalService
+from src.record_index import RecordIndex
+
+
+def _line(i: int) -> str:
+    ts = datetime.datetime(2026, 1, 1) + datetime.timedelta(minutes=i)
+    return f'{ts:%Y-%m-%d %H:%M:%S} | EVENT=TEST | n={i} | note="çğ \\"{i}\\""'
+
+
+def test_index_matches_plain_json():
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JsonStorage(str(Path(tmp) / "data"))
+        storage.records_index = RecordIndex(storage.records_path, stride=4)
+        lines = [_line(i) for i in range(30)]
+        for line in lines:
+            storage.append_record(line)
+
+        # records.json stays a regular JSON list in the original layout
+        with storage.records_path.open(encoding="utf-8") as f:
+            assert f.read() == json.dumps(lines, indent=4, ensure_ascii=False)
+        assert storage.load_records() == lines
+
+        assert storage.count_records() == 30
+        assert storage.read_records(0, 30) == lines
+        assert storage.read_records(7, 12) == lines[7:12]
+        assert storage.read_records(28, 100) == lines[28:]
+        assert storage.read_records(40, 50) == []
+
+        assert storage.find_record_at(datetime.datetime(2026, 1, 1)) == 0
+        assert storage.find_record_at(datetime.datetime(2026, 1, 1, 0, 13)) == 13
+        assert storage.find_record_at(datetime.datetime(2026, 1, 1, 0, 12, 30)) == 13
+        assert storage.find_record_at(datetime.datetime(2026, 1, 1, 0, 13, 0, 500000)) == 14
+        assert storage.find_record_at(datetime.datetime(2026, 1, 1, 0, 0, 0, 1)) == 1
+        assert storage.find_record_at(datetime.datetime(2026, 1, 2)) == 30
+
+
+def test_index_rebuilds_after_external_write():
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JsonStorage(str(Path(tmp) / "data"))
+        storage.append_record(_line(0))
+        assert storage.count_records() == 1
+
+        # Another tool rewrites the file in a different layout
+        lines = [_line(i) for i in range(5)]
+        storage.records_path.write_text(json.dumps(lines), encoding="utf-8")
+        assert storage.count_records() == 5
+        assert storage.read_records(2, 4) == lines[2:4]
+
+
+def test_log_pages_and_time_window():
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JsonStorage(str(Path(tmp) / "data"))
+        svc = CarRentalService(storage)
+        lines = [_line(i) for i in range(50)]
+        for line in lines:
+            storage.append_record(line)
+
+        assert svc.get_recent_logs(limit=3) == list(reversed(lines[-3:]))
+        assert svc.get_log_page(1, page_size=20) == lines[:20]
+        assert svc.get_log_page(3, page_size=20) == lines[40:]
+        assert svc.get_log_page(4, page_size=20) == []
+        around = svc.get_logs_around(datetime.datetime(2026, 1, 1, 0, 25), before=2, after=3)
+        assert around == lines[23:28]
+
+
+def _rewrite_same_size(path: Path, lines, keep_stat: bool) -> None:
+    # Same records, compact separators, padded with trailing whitespace so the
+    # file keeps its byte size but every offset moves.
+    old = path.stat()
+    data = json.dumps(lines, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    data += b" " * (old.st_size - len(data))
+    assert len(data) == old.st_size
+    with path.open("r+b") as f:
+        f.write(data)
+    if keep_stat:
+        os.utime(path, ns=(old.st_atime_ns, old.st_mtime_ns))
+    else:
+        os.utime(path, ns=(old.st_atime_ns, old.st_mtime_ns + 1_000_000))
+
+
+def test_index_rebuilds_after_same_size_rewrite():
+    for keep_stat in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = JsonStorage(str(Path(tmp) / "data"))
+            svc = CarRentalService(storage)
+            lines = [_line(i) for i in range(10)]
+            storage.append_records(lines)
+            assert svc.get_recent_logs(3) == list(reversed(lines[-3:]))
+
+            fixed = lines[:5] + [lines[5].replace("TEST", "FIXD")] + lines[6:]
+            _rewrite_same_size(storage.records_path, fixed, keep_stat)
+            assert svc.get_recent_logs(5) == list(reversed(fixed[-5:]))
+            assert storage.count_records() == 10
+
+
+def test_reads_never_rewrite_a_torn_log():
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JsonStorage(str(Path(tmp) / "data"))
+        svc = CarRentalService(storage)
+        lines = [_line(i) for i in range(5)]
+        storage.append_records(lines)
+
+        # What a crash in the middle of an append leaves behind
+        torn = storage.records_path.read_bytes()[:-2]
+        storage.records_path.write_bytes(torn)
+
+        assert svc.get_recent_logs(10) == list(reversed(lines))
+        assert storage.count_records() == 5
+        assert svc.get_log_page(1, page_size=2) == lines[:2]
+        assert storage.find_record_at(datetime.datetime(2026, 1, 1, 0, 3)) == 3
+        assert storage.records_path.read_bytes() == torn
+
+        # The next write repairs the log but keeps the original bytes
+        storage.append_record(_line(5))
+        assert storage.load_records() == lines + [_line(5)]
+        backups = list(storage.data_dir.glob("records.json.*.bak"))
+        assert [b.read_bytes() for b in backups] == [torn]
+
+
+def test_index_built_from_foreign_layout_without_rewriting():
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JsonStorage(str(Path(tmp) / "data"))
+        lines = [_line(i) for i in range(4)]
+        original = json.dumps(lines, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n\n"
+        storage.records_path.write_bytes(original)
+
+        assert storage.read_records(1, 3) == lines[1:3]
+        assert storage.records_path.read_bytes() == original
+
+        storage.append_record(_line(4))
+        assert json.loads(storage.records_path.read_text(encoding="utf-8")) == lines + [_line(4)]
+        assert storage.read_records(3, 5) == [_line(3), _line(4)]
+        assert list(storage.data_dir.glob("*.bak")) == []
@@ -2,6 +2,8 @@ import tempfile
 from pathlib import Path
 import datetime
 
+import pytest
+
 from src.storage import JsonStorage
 from src.service import CarRentalService
 
@@ -29,4 +31,69 @@ def test_add_rent_return_flow():
 
         svc.return_vehicle("34ABC456")
         v = svc.list_vehicles()[0]
-        assert v.status == "AVAILABLE"
\ No newline at end of file
+        assert v.status == "AVAILABLE"
+
+
+def test_rent_and_return_many():
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JsonStorage(str(Path(tmp) / "data"))
+        svc = CarRentalService(storage)
+        svc.add_vehicle("Renault Clio", "34abc456", 500)
+        svc.add_vehicle("Fiat Egea", "06ab1234", 400)
+        svc.add_vehicle("Ford Focus", "35 K 1000", 600)
+
+        # Count the writes each batch makes to every file
+        calls = {}
+
+        def counting(name):
+            real = getattr(storage, name)
+
+            def wrapper(*args):
+                calls[name] = calls.get(name, 0) + 1
+                return real(*args)
+            setattr(storage, name, wrapper)
+
+        for name in ("save_vehicles", "save_stats", "append_records", "append_record"):
+            counting(name)
+
+        start = datetime.date(2026, 2, 20)
+        end = datetime.date(2026, 2, 21)
+        results, total = svc.rent_many(["34 ABC 456", "06AB1234"], start, end)
+        assert results == [
+            ("34 ABC 456", 2, 1000, "Renault Clio"),
+            ("06 AB 1234", 2, 800, "Fiat Egea"),
+        ]
+        assert total == 1800
+        assert calls == {"save_vehicles": 1, "save_stats": 1, "append_records": 1}
+        assert storage.load_stats()["total_revenue"] == 1800
+        assert storage.count_records() == 5
+
+        calls.clear()
+        returned = svc.return_many(["34ABC456", "06 AB 1234"])
+        assert calls == {"save_vehicles": 1, "append_records": 1}
+        assert returned == [("34 ABC 456", "Renault Clio"), ("06 AB 1234", "Fiat Egea")]
+        assert all(v.status == "AVAILABLE" for v in svc.list_vehicles())
+
+
+def test_rent_many_is_all_or_nothing():
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JsonStorage(str(Path(tmp) / "data"))
+        svc = CarRentalService(storage)
+        svc.add_vehicle("Renault Clio", "34abc456", 500)
+        svc.add_vehicle("Fiat Egea", "06ab1234", 400)
+        start = datetime.date(2026, 2, 20)
+        svc.rent_vehicle("06 AB 1234", start, start)
+
+        for plates in (["34 ABC 456", "06 AB 1234"], ["34 ABC 456", "99 ZZ 999"],
+                       ["34 ABC 456", "34abc456"], []):
+            with pytest.raises(ValueError):
+                svc.rent_many(plates, start, start)
+
+        statuses = {v.plate: v.status for v in svc.list_vehicles()}
+        assert statuses == {"34 ABC 456": "AVAILABLE", "06 AB 1234": "RENTED"}
+        assert storage.load_stats()["total_revenue"] == 400
+        assert storage.count_records() == 3
+
+        with pytest.raises(ValueError):
+            svc.return_many(["06 AB 1234", "34 ABC 456"])
+        assert {v.plate: v.status for v in svc.list_vehicles()} == statuses
@@ -0,0 +1,87 @@
+import random
+import time
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from src.service import CarRentalService
+from src.storage import JsonStorage
+from src.simulator import WorkloadConfig, generate_workload, main, random_plate, run
+from src.utils import _PLATE_RE, normalize_plate
+
+
+def test_random_plates_are_valid():
+    rng = random.Random(1)
+    for _ in range(500):
+        plate = random_plate(rng)
+        assert _PLATE_RE.match(plate)
+        assert normalize_plate(plate) == plate
+
+
+def test_workload_is_deterministic():
+    config = WorkloadConfig(seed=42, fleet_size=20, operations=200, arrival_rate=100.0)
+    assert generate_workload(config) == generate_workload(config)
+    other = WorkloadConfig(seed=43, fleet_size=20, operations=200, arrival_rate=100.0)
+    assert generate_workload(config) != generate_workload(other)
+
+
+def test_replay_single_and_concurrent():
+    config = WorkloadConfig(seed=7, fleet_size=15, operations=150)
+    with tempfile.TemporaryDirectory() as tmp:
+        report = run(config, JsonStorage(str(Path(tmp) / "single")))
+        assert report.succeeded == 150
+        assert report.rejected == 0 and report.errors == 0
+        assert report.consistent, report.problems
+        assert report.percentiles()["p50"] > 0
+
+        report = run(config, JsonStorage(str(Path(tmp) / "threads")), workers=4)
+        assert report.succeeded == 150
+        assert report.rejected == 0 and report.errors == 0
+        assert report.consistent, report.problems
+
+
+class _SlowService(CarRentalService):
+    def get_report(self):
+        time.sleep(0.01)
+        return super().get_report()
+
+
+def test_open_loop_latency_includes_queueing():
+    # 1000 ops/s offered to a service that serves ~100 ops/s
+    config = WorkloadConfig(seed=1, fleet_size=5, operations=40,
+                            mix={"report": 1.0}, arrival_rate=1000.0)
+    with tempfile.TemporaryDirectory() as tmp:
+        report = run(config, JsonStorage(str(Path(tmp) / "data")), service_factory=_SlowService)
+        p = report.percentiles()
+        # The last op arrives after ~40 ms but only runs after ~400 ms of backlog
+        assert p["max"] > 250
+        assert p["p50"] > 100
+
+
+def test_cli_refuses_non_empty_data_dir():
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp) / "data"
+        storage = JsonStorage(str(data_dir))
+        storage.append_record("2026-01-01 00:00:00 | EVENT=REAL")
+
+        with pytest.raises(SystemExit):
+            main(["--ops", "5", "--data-dir", str(data_dir)])
+        assert storage.load_records() == ["2026-01-01 00:00:00 | EVENT=REAL"]
+
+        main(["--ops", "5", "--data-dir", str(data_dir), "--force"])
+        assert storage.count_records() > 1
+
+
+def test_infeasible_mix_is_reported_as_substituted():
+    config = WorkloadConfig(seed=2, fleet_size=3, operations=10, mix={"return": 1.0})
+    _fleet, ops = generate_workload(config)
+    assert all(op.kind == "add" and op.substituted for op in ops)
+
+    _fleet, ops = generate_workload(WorkloadConfig(seed=2, fleet_size=3, operations=50))
+    assert not any(op.substituted for op in ops)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = run(config, JsonStorage(str(Path(tmp) / "data")))
+        assert report.substituted == 10
+        assert "10 ops were adds substituted" in report.format()
@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from src.models import Vehicle
+from src import storage as storage_module
+from src import utils as utils_module
+from src.storage import JsonStorage
+
+
+def test_cached_loads_are_copies():
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JsonStorage(str(Path(tmp) / "data"))
+        storage.save_vehicles([Vehicle("Renault Clio", "34 ABC 456", 500)])
+
+        first = storage.load_vehicles()
+        first[0].status = "RENTED"
+        first.append(Vehicle("Fiat Egea", "06 AB 1234", 400))
+        assert storage.load_vehicles() == [Vehicle("Renault Clio", "34 ABC 456", 500)]
+
+        stats = storage.load_stats()
+        stats["total_revenue"] = 999
+        assert storage.load_stats()["total_revenue"] == 0
+
+
+def test_cache_skips_reparse_until_file_changes():
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JsonStorage(str(Path(tmp) / "data"))
+        storage.save_vehicles([Vehicle("Renault Clio", "34 ABC 456", 500)])
+
+        calls = []
+        original = storage._read_json
+
+        def counting_read(path, default):
+            calls.append(path)
+            return original(path, default)
+
+        storage._read_json = counting_read
+        storage.load_vehicles()
+        storage.load_vehicles()
+        assert calls == []
+
+        # Simulate a write from another process (different size and mtime)
+        with storage.vehicles_path.open("w", encoding="utf-8") as f:
+            json.dump([Vehicle("Fiat Egea", "06 AB 1234", 400).to_dict()] * 2, f)
+        st = storage.vehicles_path.stat()
+        os.utime(storage.vehicles_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        vehicles = storage.load_vehicles()
+        assert [v.plate for v in vehicles] == ["06 AB 1234", "06 AB 1234"]
+        assert calls == [storage.vehicles_path]
+
+
+def test_write_right_after_save_is_not_masked(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JsonStorage(str(Path(tmp) / "data"))
+        other = [Vehicle("Fiat Egea", "06 AB 1234", 400), Vehicle("Ford Focus", "35 K 1000", 600)]
+        real_replace = os.replace
+
+        def replace_then_other_writer(src, dst):
+            real_replace(src, dst)
+            # Another process rewrites the file before save_vehicles returns
+            with open(dst, "w", encoding="utf-8") as f:
+                json.dump([v.to_dict() for v in other], f)
+
+        monkeypatch.setattr(storage_module.os, "replace", replace_then_other_writer)
+        storage.save_vehicles([Vehicle("Renault Clio", "34 ABC 456", 500)])
+        monkeypatch.undo()
+
+        assert storage.load_vehicles() == other
+
+
+def test_replace_retries_while_file_is_held_open(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JsonStorage(str(Path(tmp) / "data"))
+        real_replace = os.replace
+        failures = [2]
+
+        def flaky_replace(src, dst):
+            # Windows: the destination is open in a reader thread
+            if failures[0]:
+                failures[0] -= 1
+                raise PermissionError(13, "Access is denied", str(dst))
+            real_replace(src, dst)
+
+        monkeypatch.setattr(storage_module.os, "replace", flaky_replace)
+        monkeypatch.setattr(utils_module.time, "sleep", lambda _s: None)
+        storage.save_vehicles([Vehicle("Renault Clio", "34 ABC 456", 500)])
+        monkeypatch.undo()
+
+        assert failures == [0]
+        assert storage.load_vehicles() == [Vehicle("Renault Clio", "34 ABC 456", 500)]
+        assert [p.name for p in storage.data_dir.iterdir() if p.suffix == ".tmp"] == []